@@ -25,4 +25,4 @@ class ParcelsAppUpdateButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Handle the button press."""
-        await self.coordinator.update_tracked_packages()
+        await self.coordinator.async_request_refresh()
@@ -1,22 +1,48 @@
+import asyncio
 from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import itemgetter
 import logging
 import time
 import json
+import random
 import aiohttp
-import async_timeout
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.storage import Store
+from homeassistant.util.json import json_loads
 
 from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
 
 _LOGGER = logging.getLogger(__name__)
 
+_TRACKING_URL = "https://parcelsapp.com/api/v3/shipments/tracking"
+
+# Maximum number of characters of an API response included in log messages
+_LOG_PAYLOAD_LIMIT = 500
+
+# Seconds to wait so that several package changes end up in a single store write
+_SAVE_DELAY = 10
+
+# Maximum number of concurrent requests to ParcelsApp
+_MAX_CONCURRENT_REQUESTS = 8
+
+# Retries for transient failures, with exponential backoff and jitter (seconds)
+_MAX_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 1
+_RETRY_MAX_DELAY = 10
+_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Consecutive failed requests after which requests are skipped for a while
+_BREAKER_THRESHOLD = 5
+_BREAKER_RESET_TIME = 60
+
 # Country code → readable country name
 COUNTRY_MAP = {
     "NL": "Netherlands",
@@ -36,11 +62,28 @@ COUNTRY_MAP = {
     "FI": "Finland",
 }
 
+# Packages in these states are no longer refreshed
+_TERMINAL_STATUSES = frozenset({"delivered", "archived"})
+
+# Packages in these states are located at their destination
+_DESTINATION_STATUSES = frozenset(
+    {"delivered", "out_for_delivery", "pickup", "ready_for_pickup"}
+)
+
+# How long a tracking UUID can be polled before a new one is requested
+_UUID_TTL = timedelta(minutes=30)
+
 
 def _parse_iso(dt_str: str) -> datetime | None:
     """Parse ISO8601 date string safely, handling 'Z' timezone."""
     if not dt_str or not isinstance(dt_str, str):
         return None
+    return _parse_iso_cached(dt_str)
+
+
+@lru_cache(maxsize=4096)
+def _parse_iso_cached(dt_str: str) -> datetime | None:
+    """Parse a non-empty ISO8601 date string, memoized per unique string."""
     try:
         if dt_str.endswith("Z"):
             dt_str = dt_str.replace("Z", "+00:00")
@@ -54,40 +97,38 @@ def resolve_location(shipment: dict) -> str | None:
     Determine the most accurate current location for a shipment.
 
     Strategy:
-      1. Find the newest state (by date) that has a 'location'.
-      2. If none, and status is delivered/pickup/out_for_delivery, use destination.
-      3. Otherwise use origin as fallback.
+      1. Use the location of 'lastState' if it has one.
+      2. Otherwise find the newest state (by date) that has a 'location'.
+      3. If none, and status is delivered/pickup/out_for_delivery, use destination.
+      4. Otherwise use origin as fallback.
     """
-    states = shipment.get("states", []) or []
-
-    best_state = None
-    best_time = None
-
-    for state in states:
-        loc = state.get("location")
-        if not loc:
-            continue
-
-        dt = _parse_iso(state.get("date"))
-        if dt is None:
-            if best_state is None:
-                best_state = state
-            continue
-
-        if best_time is None or dt > best_time:
-            best_time = dt
-            best_state = state
+    loc = (shipment.get("lastState") or {}).get("location")
+
+    if not loc:
+        candidates = [
+            (state["location"], _parse_iso(state.get("date")))
+            for state in shipment.get("states") or ()
+            if state.get("location")
+        ]
+        newest = max(
+            (candidate for candidate in candidates if candidate[1] is not None),
+            key=itemgetter(1),
+            default=None,
+        )
+        # States without a usable date only count when none has one
+        best = newest or (candidates[0] if candidates else None)
+        if best:
+            loc = best[0]
 
-    if best_state:
-        loc = best_state.get("location")
-        if loc:
-            if len(loc) == 2 and loc.isalpha():
-                return COUNTRY_MAP.get(loc.upper(), loc)
-            return loc
+    if loc:
+        if len(loc) == 2:
+            # Country codes usually arrive upper-case already
+            return COUNTRY_MAP.get(loc) or COUNTRY_MAP.get(loc.upper(), loc)
+        return loc
 
     status = (shipment.get("status") or "").lower()
 
-    if status in ("delivered", "out_for_delivery", "pickup", "ready_for_pickup"):
+    if status in _DESTINATION_STATUSES:
         dest = shipment.get("destination")
         if dest:
             return dest
@@ -99,9 +140,58 @@ def resolve_location(shipment: dict) -> str | None:
     return None
 
 
+def _is_active(package: dict | None) -> bool:
+    """Return True if a tracked package still needs to be refreshed."""
+    return package is not None and package.get("status") not in _TERMINAL_STATUSES
+
+
+def _normalize_tracking_id(tracking_id) -> str:
+    """Return a tracking ID in a form that survives ParcelsApp's reformatting."""
+    return "".join(str(tracking_id).split()).replace("-", "").upper()
+
+
+def _match_shipments(shipments: list[dict], tracking_ids: list[str]) -> dict:
+    """Map shipments in an API response back to the requested tracking IDs."""
+    requested = {
+        _normalize_tracking_id(tracking_id): tracking_id for tracking_id in tracking_ids
+    }
+    matched = {}
+    unmatched = []
+    for shipment in shipments:
+        returned_id = shipment.get("trackingId", "")
+        tracking_id = requested.get(_normalize_tracking_id(returned_id))
+        if tracking_id:
+            matched[tracking_id] = shipment
+        else:
+            unmatched.append(returned_id)
+
+    # Single-package responses don't always echo the tracking ID back
+    if not matched and shipments and len(tracking_ids) == 1:
+        matched[tracking_ids[0]] = shipments[0]
+    elif unmatched:
+        _LOGGER.debug(
+            "Ignoring shipments %s that match none of the requested tracking IDs %s",
+            ", ".join(map(str, unmatched)),
+            ", ".join(tracking_ids),
+        )
+    return matched
+
+
+async def _read_json_object(response: aiohttp.ClientResponse) -> dict:
+    """Decode a JSON object from a response, raising JSONDecodeError otherwise."""
+    data = await response.json(loads=json_loads, content_type=None)
+    if not isinstance(data, dict):
+        # An empty body decodes to None instead of failing to parse
+        raise json.JSONDecodeError("Expected a JSON object", str(data), 0)
+    return data
+
+
 class ParcelsAppCoordinator(DataUpdateCoordinator):
     """Custom coordinator for Parcels App."""
 
+    _REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=15, connect=5)
+    _STATUS_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         super().__init__(
             hass,
@@ -111,12 +201,35 @@ class ParcelsAppCoordinator(DataUpdateCoordinator):
         )
         self.api_key = entry.data["api_key"]
         self.destination_country = entry.data["destination_country"]
-        self.session = aiohttp.ClientSession()
+        # Owned by Home Assistant and shared with other integrations, so it must
+        # never be closed here, not even when the config entry is unloaded
+        self.session = async_get_clientsession(hass)
         self.tracked_packages: dict[str, dict] = {}
         self.store = Store(hass, 1, f"{DOMAIN}_{entry.entry_id}_tracked_packages")
+        # Set when packages change during an update cycle, flushed once at its end
+        self._dirty = False
+        # Number of tracked packages that are not delivered or archived
+        self._active_count = 0
+        # Clock reading shared by every package updated in the current cycle
+        self._cycle_now: datetime | None = None
+        self._cycle_now_iso: str | None = None
+        # HEAD avoids downloading the homepage, GET is the fallback
+        self._probe_with_head = True
+        # Caps the number of requests in flight to ParcelsApp
+        self._request_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+        # Circuit breaker state for requests to ParcelsApp
+        self._breaker_failures = 0
+        self._breaker_opened_at: float | None = None
+        # Set while a trial request decides whether the breaker closes again
+        self._breaker_trial: asyncio.Event | None = None
 
         language_code = (hass.config.language or "en")[:2].lower()
         self.language = language_code
+        # Fields shared by every tracking request, only the shipments differ
+        self._tracking_request_base = {
+            "language": self.language,
+            "apiKey": self.api_key,
+        }
 
     async def async_init(self):
         await self._load_tracked_packages()
@@ -124,190 +237,272 @@ class ParcelsAppCoordinator(DataUpdateCoordinator):
     async def _load_tracked_packages(self):
         stored_data = await self.store.async_load()
         if stored_data:
-            for package in stored_data.values():
-                if (
-                    "uuid_timestamp" in package
-                    and isinstance(package["uuid_timestamp"], str)
-                ):
-                    package["uuid_timestamp"] = datetime.fromisoformat(
-                        package["uuid_timestamp"]
-                    )
+            # uuid_timestamp stays an ISO string until it is first checked
             self.tracked_packages = stored_data
         else:
             self.tracked_packages = {}
+        self._active_count = sum(map(_is_active, self.tracked_packages.values()))
 
-    async def _save_tracked_packages(self):
-        for package in self.tracked_packages.values():
-            if (
-                "uuid_timestamp" in package
-                and isinstance(package["uuid_timestamp"], datetime)
-            ):
-                package["uuid_timestamp"] = package["uuid_timestamp"].isoformat()
-        await self.store.async_save(self.tracked_packages)
-        await self.async_request_refresh()
+    def _now(self) -> datetime:
+        """Return the time of the running update cycle, or now outside of one."""
+        return self._cycle_now or datetime.now()
 
-    async def track_package(self, tracking_id: str, name: str | None = None) -> None:
-        """Track a new package or update an existing one."""
-        url = "https://parcelsapp.com/api/v3/shipments/tracking"
-        payload = json.dumps(
-            {
-                "shipments": [
-                    {
-                        "trackingId": tracking_id,
-                        "destinationCountry": self.destination_country,
-                    }
-                ],
-                "language": self.language,
-                "apiKey": self.api_key,
-            }
-        )
-        headers = {"Content-Type": "application/json"}
+    def _data_to_save(self) -> dict:
+        """Return a JSON-serializable copy of the tracked packages."""
+        return {
+            tracking_id: (
+                {**package, "uuid_timestamp": package["uuid_timestamp"].isoformat()}
+                if isinstance(package.get("uuid_timestamp"), datetime)
+                else package
+            )
+            for tracking_id, package in self.tracked_packages.items()
+        }
 
+    def _save_tracked_packages(self) -> None:
+        self.store.async_delay_save(self._data_to_save, _SAVE_DELAY)
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        read_body: bool = True,
+        attempts: int = _MAX_ATTEMPTS,
+        **kwargs,
+    ) -> tuple[aiohttp.ClientResponse, float]:
+        """Send a request to ParcelsApp, retrying transient failures.
+
+        Connection errors, timeouts and 429/5xx responses are retried with
+        jittered exponential backoff. After too many consecutive failures the
+        circuit breaker opens and requests fail fast until it resets, after
+        which a single trial request decides whether it closes again; requests
+        arriving meanwhile wait for its outcome. Unless
+        read_body is False, the body is read before returning, so the response
+        stays usable after release.
+
+        Returns the response and the duration in seconds of the final attempt,
+        excluding backoff sleeps and the wait for a free request slot.
+        """
+        trial = None
+        while self._breaker_opened_at is not None:
+            if self._breaker_trial is not None:
+                # Requests of the same cycle shouldn't fail just because another
+                # one was picked as the trial, so follow its outcome instead
+                await self._breaker_trial.wait()
+                continue
+            if time.monotonic() - self._breaker_opened_at < _BREAKER_RESET_TIME:
+                raise UpdateFailed("ParcelsApp is unavailable, skipping request")
+            # Let a single request through to probe whether ParcelsApp has recovered
+            self._breaker_trial = trial = asyncio.Event()
+            break
+
+        kwargs.setdefault("timeout", self._REQUEST_TIMEOUT)
         try:
-            async with self.session.post(
-                url, headers=headers, data=payload
-            ) as response:
-                response_text = await response.text()
-                response.raise_for_status()
-                data = json.loads(response_text)
+            for attempt in range(attempts):
+                last_attempt = attempt == attempts - 1
+                try:
+                    # Held per attempt only, so backoff sleeps don't block others
+                    async with self._request_semaphore:
+                        start_time = time.perf_counter()
+                        async with self.session.request(
+                            method, url, **kwargs
+                        ) as response:
+                            if read_body:
+                                await response.read()
+                        elapsed = time.perf_counter() - start_time
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    if last_attempt:
+                        self._record_request_failure()
+                        raise
+                else:
+                    if response.status not in _RETRY_STATUSES:
+                        self._breaker_failures = 0
+                        self._breaker_opened_at = None
+                        return response, elapsed
+                    if last_attempt:
+                        self._record_request_failure()
+                        return response, elapsed
+
+                delay = min(_RETRY_BASE_DELAY * 2**attempt, _RETRY_MAX_DELAY)
+                await asyncio.sleep(delay * (0.9 + 0.2 * random.random()))
+        finally:
+            if trial is not None:
+                self._breaker_trial = None
+                trial.set()
+
+    def _record_request_failure(self) -> None:
+        self._breaker_failures += 1
+        if self._breaker_failures >= _BREAKER_THRESHOLD:
+            _LOGGER.warning(
+                "ParcelsApp failed %s times in a row, pausing requests for %s seconds",
+                self._breaker_failures,
+                _BREAKER_RESET_TIME,
+            )
+            self._breaker_opened_at = time.monotonic()
+
+    def _build_tracking_payload(self, tracking_ids: list[str]) -> dict:
+        """Build the body of a tracking request for the given tracking IDs."""
+        return {
+            "shipments": [
+                {
+                    "trackingId": tracking_id,
+                    "destinationCountry": self.destination_country,
+                }
+                for tracking_id in tracking_ids
+            ],
+            **self._tracking_request_base,
+        }
 
-                existing_package_data = self.tracked_packages.get(tracking_id, {})
+    async def track_package(self, tracking_id: str, name: str | None = None) -> None:
+        """Track a new package or update an existing one."""
+        payload = self._build_tracking_payload([tracking_id])
 
-                if "uuid" in data:
-                    # UUID returned — tracking initiated
-                    package_data = {
-                        **existing_package_data,
+        try:
+            response, _ = await self._request("POST", _TRACKING_URL, json=payload)
+            response.raise_for_status()
+            data = await _read_json_object(response)
+
+            if "uuid" in data:
+                # UUID returned — tracking initiated
+                was_active = _is_active(self.tracked_packages.get(tracking_id))
+                package = self.tracked_packages.setdefault(tracking_id, {})
+                now = datetime.now()
+                now_iso = now.isoformat()
+                package.update(
+                    {
                         "status": "pending",
                         "uuid": data["uuid"],
-                        "uuid_timestamp": datetime.now(),
+                        "uuid_timestamp": now,
                         "message": "Tracking initiated",
-                        "last_updated": datetime.now().isoformat(),
-                        "status_changed_at": datetime.now().isoformat(),
-                        "name": name or existing_package_data.get("name"),
-                    }
-                    self.tracked_packages[tracking_id] = package_data
-
-                elif "shipments" in data and data["shipments"]:
-                    # Shipment data returned directly
-                    shipment = data["shipments"][0]
-
-                    resolved_location = resolve_location(shipment)
-
-                    eta = shipment.get("eta") or {}
-                    eta_period = eta.get("period", [])
-                    eta_remaining = eta.get("remaining", [])
-
-                    eta_days_range = (
-                        f"{eta_remaining[0]}–{eta_remaining[1]}"
-                        if eta_remaining and len(eta_remaining) == 2
-                        else None
-                    )
-
-                    eta_date_range = (
-                        f"{eta_period[0]}/{eta_period[1]}"
-                        if eta_period and len(eta_period) == 2
-                        else None
-                    )
-
-                    expected_delivery = None
-                    for attr in shipment.get("attributes", []):
-                        if attr.get("l") == "eta":
-                            expected_delivery = attr.get("val")
-
-                    now_iso = datetime.now().isoformat()
-                    new_status = shipment.get("status", "unknown")
-
-                    package_data = {
-                        **existing_package_data,
-                        "status": new_status,
-                        "message": shipment.get("lastState", {}).get(
-                            "status", "No status available"
-                        ),
-                        "location": resolved_location,
-                        "origin": shipment.get("origin"),
-                        "destination": shipment.get("destination"),
-                        "carrier": shipment.get("detectedCarrier", {}).get("name"),
-                        "days_in_transit": next(
-                            (
-                                attr.get("val")
-                                for attr in shipment.get("attributes", [])
-                                if attr.get("l") == "days_transit"
-                            ),
-                            None,
-                        ),
-                        "eta_days_range": eta_days_range,
-                        "eta_date_range": eta_date_range,
-                        "expected_delivery": expected_delivery,
                         "last_updated": now_iso,
                         "status_changed_at": now_iso,
-                        "name": name or existing_package_data.get("name"),
-                        "tracking_id": tracking_id,
                     }
-                    self.tracked_packages[tracking_id] = package_data
+                )
+                if name:
+                    package["name"] = name
+                self._active_count += _is_active(package) - was_active
+
+            elif "shipments" in data and data["shipments"]:
+                # Shipment data returned directly
+                self._update_shipment(
+                    tracking_id,
+                    data["shipments"][0],
+                    datetime.now().isoformat(),
+                    name,
+                )
 
-                else:
-                    _LOGGER.error("Unexpected API response: %s", response_text)
-                    return
+            else:
+                # Usually an API error such as an invalid key or exhausted quota
+                _LOGGER.warning(
+                    "Unexpected API response for %s: %s",
+                    tracking_id,
+                    str(data)[:_LOG_PAYLOAD_LIMIT],
+                )
+                return
 
-            await self._save_tracked_packages()
+            self._save_tracked_packages()
+            if "uuid" in data:
+                # Poll the new UUID now instead of at the next scheduled update
+                await self.async_request_refresh()
+            else:
+                self.async_update_listeners()
 
         except aiohttp.ClientError as err:
             _LOGGER.error("Error tracking package %s: %s", tracking_id, err)
+        except UpdateFailed as err:
+            _LOGGER.warning("Not tracking package %s: %s", tracking_id, err)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Timeout tracking package %s", tracking_id)
         except json.JSONDecodeError:
             _LOGGER.error(
                 "Failed to parse response for %s. Response: %s",
                 tracking_id,
-                response_text,
+                (await response.text())[:_LOG_PAYLOAD_LIMIT],
             )
 
     async def remove_package(self, tracking_id: str) -> None:
         if tracking_id in self.tracked_packages:
-            del self.tracked_packages[tracking_id]
-            await self._save_tracked_packages()
+            package = self.tracked_packages.pop(tracking_id)
+            self._active_count -= _is_active(package)
+            self._save_tracked_packages()
+            self.async_update_listeners()
         else:
             _LOGGER.warning("Cannot remove package: not found: %s", tracking_id)
 
-    async def update_package(
-        self, tracking_id: str, uuid: str | None, uuid_timestamp: datetime | None
-    ) -> None:
+    def _uuid_expired(
+        self, tracking_id: str, uuid: str | None, uuid_timestamp: datetime | str | None
+    ) -> bool:
+        """Return True if a package needs a new tracking UUID."""
+        if not uuid or not uuid_timestamp:
+            return True
         if isinstance(uuid_timestamp, str):
-            uuid_timestamp = datetime.fromisoformat(uuid_timestamp)
-
-        uuid_expired = False
-        if uuid_timestamp:
-            if datetime.now() - uuid_timestamp > timedelta(minutes=30):
-                uuid_expired = True
-        else:
-            uuid_expired = True
+            # Loaded from the store, keep the parsed value for later checks
+            uuid_timestamp = _parse_iso(uuid_timestamp)
+            if uuid_timestamp is None:
+                return True
+            self.tracked_packages[tracking_id]["uuid_timestamp"] = uuid_timestamp
+        return uuid_timestamp < self._now() - _UUID_TTL
+
+    async def _update_packages(
+        self, packages: list[tuple[str, str | None, datetime | str | None]]
+    ) -> None:
+        """Update packages, requesting new UUIDs for all of them in one call.
+
+        Shipment data is fetched concurrently and applied once every request has
+        finished.
+        """
+        # Outside of an update cycle there is no shared clock reading to reuse
+        now_iso = self._cycle_now_iso or datetime.now().isoformat()
+        pending: dict[str, list[str]] = {}
+        expired = []
+        for tracking_id, uuid, uuid_timestamp in packages:
+            if self._uuid_expired(tracking_id, uuid, uuid_timestamp):
+                expired.append(tracking_id)
+            else:
+                pending.setdefault(uuid, []).append(tracking_id)
 
-        if uuid_expired or not uuid:
-            new_uuid, new_uuid_timestamp, shipment_data = await self.get_new_uuid(
-                tracking_id
+        if expired:
+            new_uuid, new_uuid_timestamp, shipments = await self._batch_get_uuids(
+                expired
             )
+            for tracking_id in expired:
+                if tracking_id not in self.tracked_packages:
+                    # Removed while the request was in flight
+                    continue
+                if tracking_id in shipments:
+                    self._update_shipment(
+                        tracking_id, shipments[tracking_id], now_iso
+                    )
+                elif new_uuid:
+                    package = self.tracked_packages.setdefault(tracking_id, {})
+                    package["uuid"] = new_uuid
+                    package["uuid_timestamp"] = new_uuid_timestamp
+                    pending.setdefault(new_uuid, []).append(tracking_id)
+                    self._dirty = True
+                else:
+                    _LOGGER.error(
+                        "No UUID and no shipment data for tracking ID %s", tracking_id
+                    )
 
-            if shipment_data:
-                await self._update_shipment(tracking_id, shipment_data)
-                return
-
-            if new_uuid:
-                package = self.tracked_packages.get(tracking_id, {})
-                package["uuid"] = new_uuid
-                package["uuid_timestamp"] = new_uuid_timestamp
-                self.tracked_packages[tracking_id] = package
-                await self._save_tracked_packages()
-                uuid = new_uuid
-                uuid_timestamp = new_uuid_timestamp
-            else:
+        groups = list(pending.items())
+        results = await asyncio.gather(
+            *(
+                self._fetch_shipment_data(uuid, tracking_ids)
+                for uuid, tracking_ids in groups
+            ),
+            return_exceptions=True,
+        )
+        for (_, tracking_ids), result in zip(groups, results):
+            if isinstance(result, Exception):
                 _LOGGER.error(
-                    "No UUID and no shipment data for tracking ID %s", tracking_id
+                    "Error updating packages %s: %s", ", ".join(tracking_ids), result
                 )
-                return
-
-        await self._fetch_shipment_data(tracking_id, uuid)
-
-    async def _update_shipment(self, tracking_id: str, shipment: dict) -> None:
-        resolved_location = resolve_location(shipment)
+                continue
+            for tracking_id, shipment in result.items():
+                if tracking_id in self.tracked_packages:
+                    self._update_shipment(tracking_id, shipment, now_iso)
 
+    def _build_package_data(self, shipment: dict, existing: dict, now_iso: str) -> dict:
+        """Build the package fields to update from a shipment returned by the API."""
         eta = shipment.get("eta") or {}
         eta_period = eta.get("period", [])
         eta_remaining = eta.get("remaining", [])
@@ -325,60 +520,87 @@ class ParcelsAppCoordinator(DataUpdateCoordinator):
         )
 
         expected_delivery = None
-        for attr in shipment.get("attributes", []):
-            if attr.get("l") == "eta":
+        days_in_transit = None
+        for attr in shipment.get("attributes") or []:
+            label = attr.get("l")
+            if label == "eta":
                 expected_delivery = attr.get("val")
+            elif label == "days_transit" and days_in_transit is None:
+                days_in_transit = attr.get("val")
 
-        package_data = self.tracked_packages.get(tracking_id, {})
-        old_status = package_data.get("status")
+        last_state = shipment.get("lastState") or {}
+        old_status = existing.get("status")
         new_status = shipment.get("status", "unknown")
-        now_iso = datetime.now().isoformat()
 
-        status_changed_at = package_data.get("status_changed_at")
+        status_changed_at = existing.get("status_changed_at")
         if old_status is None or new_status != old_status:
             status_changed_at = now_iso
 
-        package_data.update(
-            {
-                "status": new_status,
-                "message": shipment.get("lastState", {}).get(
-                    "status", "No status available"
-                ),
-                "location": resolved_location,
-                "origin": shipment.get("origin"),
-                "destination": shipment.get("destination"),
-                "carrier": shipment.get("detectedCarrier", {}).get("name"),
-                "days_in_transit": next(
-                    (
-                        attr.get("val")
-                        for attr in shipment.get("attributes", [])
-                        if attr.get("l") == "days_transit"
-                    ),
-                    None,
-                ),
-                "eta_days_range": eta_days_range,
-                "eta_date_range": eta_date_range,
-                "expected_delivery": expected_delivery,
-                "last_updated": now_iso,
-                "status_changed_at": status_changed_at,
-            }
-        )
+        return {
+            "status": new_status,
+            "message": last_state.get("status", "No status available"),
+            "location": resolve_location(shipment),
+            "origin": shipment.get("origin"),
+            "destination": shipment.get("destination"),
+            "carrier": shipment.get("detectedCarrier", {}).get("name"),
+            "days_in_transit": days_in_transit,
+            "eta_days_range": eta_days_range,
+            "eta_date_range": eta_date_range,
+            "expected_delivery": expected_delivery,
+            "last_updated": now_iso,
+            "status_changed_at": status_changed_at,
+        }
 
-        self.tracked_packages[tracking_id] = package_data
-        await self._save_tracked_packages()
+    def _update_shipment(
+        self, tracking_id: str, shipment: dict, now_iso: str, name: str | None = None
+    ) -> None:
+        was_active = _is_active(self.tracked_packages.get(tracking_id))
+        package = self.tracked_packages.setdefault(tracking_id, {})
+        package.update(self._build_package_data(shipment, package, now_iso))
+        if name:
+            package["name"] = name
+        self._active_count += _is_active(package) - was_active
+        self._dirty = True
 
     async def update_tracked_packages(self) -> None:
-        """Update all tracked packages (including delivered and archived)."""
-        for tracking_id, package_data in self.tracked_packages.items():
-            await self.update_package(
-                tracking_id,
-                package_data.get("uuid"),
-                package_data.get("uuid_timestamp"),
-            )
+        """Update all tracked packages that are not delivered or archived."""
+        if not self._active_count:
+            return
+
+        await self._update_packages(
+            [
+                (
+                    tracking_id,
+                    package_data.get("uuid"),
+                    package_data.get("uuid_timestamp"),
+                )
+                for tracking_id, package_data in self.tracked_packages.items()
+                if package_data.get("status") not in _TERMINAL_STATUSES
+            ]
+        )
 
     async def _async_update_data(self):
-        status_data = await self._fetch_parcels_app_status()
-        await self.update_tracked_packages()
+        self._cycle_now = datetime.now()
+        self._cycle_now_iso = self._cycle_now.isoformat()
+        try:
+            # Independent requests, so overlap them; both finish before returning
+            results = await asyncio.gather(
+                self._fetch_parcels_app_status(),
+                self.update_tracked_packages(),
+                return_exceptions=True,
+            )
+        finally:
+            self._cycle_now = None
+            self._cycle_now_iso = None
+
+        if self._dirty:
+            self._save_tracked_packages()
+            self._dirty = False
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+        status_data = results[0]
         return {
             "parcels_app_status": status_data,
             "tracked_packages": self.tracked_packages,
@@ -386,73 +608,102 @@ class ParcelsAppCoordinator(DataUpdateCoordinator):
 
     async def _fetch_parcels_app_status(self):
         try:
-            start_time = time.time()
-            async with async_timeout.timeout(10):
-                async with self.session.get("https://parcelsapp.com/") as response:
-                    await response.text()
-                    response.raise_for_status()
-                    end_time = time.time()
-                    response_time = end_time - start_time
-                    return {
-                        "status": response.status == 200,
-                        "response_time": response_time,
-                        "response_code": response.status,
-                    }
+            method = "HEAD" if self._probe_with_head else "GET"
+            # A single attempt keeps the probe within its timeout
+            response, response_time = await self._request(
+                method,
+                "https://parcelsapp.com/",
+                read_body=False,
+                attempts=1,
+                allow_redirects=True,
+                timeout=self._STATUS_TIMEOUT,
+            )
+            if not (self._probe_with_head and response.status in (405, 501)):
+                response.raise_for_status()
+                return {
+                    "status": response.status == 200,
+                    "response_time": response_time,
+                    "response_code": response.status,
+                }
         except aiohttp.ClientError as err:
             raise UpdateFailed(f"Error communicating with ParcelsApp: {err}")
 
-    async def get_new_uuid(self, tracking_id: str):
-        url = "https://parcelsapp.com/api/v3/shipments/tracking"
-        payload = json.dumps(
-            {
-                "shipments": [
-                    {
-                        "trackingId": tracking_id,
-                        "destinationCountry": self.destination_country,
-                    }
-                ],
-                "language": self.language,
-                "apiKey": self.api_key,
-            }
-        )
-        headers = {"Content-Type": "application/json"}
+        # The server rejects HEAD requests, probe with GET from now on
+        self._probe_with_head = False
+        return await self._fetch_parcels_app_status()
 
-        try:
-            async with self.session.post(
-                url, headers=headers, data=payload
-            ) as response:
-                response_text = await response.text()
-                response.raise_for_status()
-                data = json.loads(response_text)
+    async def _batch_get_uuids(
+        self, tracking_ids: list[str]
+    ) -> tuple[str | None, datetime | None, dict[str, dict]]:
+        """Request tracking for several packages with a single API call.
 
-                if "uuid" in data:
-                    return data["uuid"], datetime.now(), None
-                if "shipments" in data and data["shipments"]:
-                    return None, None, data["shipments"][0]
+        Returns the UUID to poll for pending shipments, its timestamp, and any
+        shipments returned directly, keyed by tracking ID.
+        """
+        payload = self._build_tracking_payload(tracking_ids)
 
-                _LOGGER.error("Unexpected UUID response: %s", response_text)
-                return None, None, None
+        try:
+            response, _ = await self._request("POST", _TRACKING_URL, json=payload)
+            response.raise_for_status()
+            data = await _read_json_object(response)
+
+            shipments = _match_shipments(data.get("shipments") or [], tracking_ids)
+            if "uuid" in data:
+                return data["uuid"], self._now(), shipments
+            if shipments:
+                return None, None, shipments
+
+            # Same request as track_package, so this is usually an API error too
+            _LOGGER.warning(
+                "Unexpected UUID response for %s: %s",
+                ", ".join(tracking_ids),
+                str(data)[:_LOG_PAYLOAD_LIMIT],
+            )
+            return None, None, {}
 
         except aiohttp.ClientError as err:
-            _LOGGER.error("UUID request error for %s: %s", tracking_id, err)
-            return None, None, None
+            _LOGGER.error(
+                "UUID request error for %s: %s", ", ".join(tracking_ids), err
+            )
+            return None, None, {}
+        except asyncio.TimeoutError:
+            _LOGGER.warning("UUID request timed out for %s", ", ".join(tracking_ids))
+            return None, None, {}
+        except json.JSONDecodeError:
+            _LOGGER.error(
+                "Failed to parse UUID response for %s. Response: %s",
+                ", ".join(tracking_ids),
+                (await response.text())[:_LOG_PAYLOAD_LIMIT],
+            )
+            return None, None, {}
 
-    async def _fetch_shipment_data(self, tracking_id: str, uuid: str) -> None:
-        url = (
-            "https://parcelsapp.com/api/v3/shipments/tracking"
-            f"?uuid={uuid}&apiKey={self.api_key}&language={self.language}"
-        )
+    async def _fetch_shipment_data(
+        self, uuid: str, tracking_ids: list[str]
+    ) -> dict[str, dict]:
+        """Fetch the shipments tracked under a UUID, keyed by tracking ID."""
+        params = {"uuid": uuid, **self._tracking_request_base}
 
         try:
-            async with self.session.get(url) as response:
-                response.raise_for_status()
-                data = await response.json()
+            response, _ = await self._request("GET", _TRACKING_URL, params=params)
+            response.raise_for_status()
+            data = await _read_json_object(response)
 
-                if data.get("done") and data.get("shipments"):
-                    shipment = data["shipments"][0]
-                    await self._update_shipment(tracking_id, shipment)
-                else:
-                    _LOGGER.debug("No tracking data yet for %s", tracking_id)
+            if data.get("done") and data.get("shipments"):
+                return _match_shipments(data["shipments"], tracking_ids)
+
+            _LOGGER.debug("No tracking data yet for %s", ", ".join(tracking_ids))
 
         except aiohttp.ClientError as err:
-            _LOGGER.error("Error updating shipment %s: %s", tracking_id, err)
+            _LOGGER.error(
+                "Error updating shipments %s: %s", ", ".join(tracking_ids), err
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.warning("Timeout updating shipments %s", ", ".join(tracking_ids))
+        except json.JSONDecodeError:
+            _LOGGER.error(
+                "Failed to parse shipment data for %s. Response: %s",
+                ", ".join(tracking_ids),
+                (await response.text())[:_LOG_PAYLOAD_LIMIT],
+            )
+
+        return {}